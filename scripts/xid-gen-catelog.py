@@ -15,93 +15,154 @@ Parses the provided XID catalog Excel file (sheet1 and sheet2) and writes Go
 data structures to the specified output path.
 """
 import datetime
+import functools
+import operator
 import sys
-import zipfile
 import xml.etree.ElementTree as ET
+import zipfile
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, TextIO
 
 NS = {"main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+# Namespace-qualified tags, precomputed to avoid prefix resolution per element.
+ROW_TAG = f"{{{NS['main']}}}row"
+C_TAG = f"{{{NS['main']}}}c"
+V_TAG = f"{{{NS['main']}}}v"
+SI_TAG = f"{{{NS['main']}}}si"
+T_TAG = f"{{{NS['main']}}}t"
+IS_TAG = f"{{{NS['main']}}}is"
+
+
+class CatalogEntry(NamedTuple):
+    code: int
+    mnemonic: str
+    description: str
+    immediate: str
+    investigatory: str
+
+
+class NvlinkRule(NamedTuple):
+    xid: int
+    unit: str
+    intrinfo_v1: str
+    intrinfo_v2: str
+    error_status: int
+    resolution: str
+    investigatory: str
+    severity: str
+    # optional columns; empty when absent from the sheet
+    action2: str = ""
+    hw_sw: str = ""
+    local_remote: str = ""
+
+
+def release_element(elem: Any) -> None:
+    """Frees the contents of an element already consumed from iterparse.
+
+    The emptied element stays attached to its parent: xml.etree has no parent
+    pointer, and tracking one via "start" events costs more than it saves.
+    """
+    elem.clear()
 
 
 def load_shared_strings(zf: zipfile.ZipFile) -> List[str]:
     shared_strings: List[str] = []
     if "xl/sharedStrings.xml" not in zf.namelist():
         return shared_strings
-    root = ET.fromstring(zf.read("xl/sharedStrings.xml"))
-    for si in root.findall("main:si", NS):
-        text_fragments: List[str] = []
-        for node in si.findall(".//main:t", NS):
-            if node.text:
-                text_fragments.append(node.text)
-        shared_strings.append("".join(text_fragments))
+    with zf.open("xl/sharedStrings.xml") as f:
+        for _, si in ET.iterparse(f, events=("end",)):
+            if si.tag != SI_TAG:
+                continue
+            shared_strings.append("".join(t.text or "" for t in si.iter(T_TAG)))
+            release_element(si)
     return shared_strings
 
 
-def read_sheet(zf: zipfile.ZipFile, sheet_name: str, shared_strings: List[str]) -> List[List[str]]:
-    sheet = ET.fromstring(zf.read(sheet_name))
-    rows: List[List[str]] = []
-    for row in sheet.findall("main:sheetData/main:row", NS):
-        values: List[str] = []
-        for c in row.findall("main:c", NS):
-            cell_type = c.get("t")
-            v = c.find("main:v", NS)
-            if v is None:
-                values.append("")
+def iter_rows(
+    zf: zipfile.ZipFile,
+    sheet_name: str,
+    get_shared_strings: Callable[[zipfile.ZipFile], List[str]],
+) -> Iterator[List[str]]:
+    # shared strings are only loaded once a cell actually references them
+    shared_strings = None
+    with zf.open(sheet_name) as f:
+        for _, row in ET.iterparse(f, events=("end",)):
+            if row.tag != ROW_TAG:
                 continue
-            if cell_type == "s":
-                idx = int(v.text)
-                values.append(shared_strings[idx])
-            else:
-                values.append(v.text or "")
-        if values:
-            rows.append(values)
-    return rows
+            values: List[str] = []
+            append = values.append
+            for c in row.iterfind(C_TAG):
+                cell_type = c.get("t")
+                if cell_type == "inlineStr":
+                    is_el = c.find(IS_TAG)
+                    if is_el is None:
+                        append("")
+                    else:
+                        append("".join(t.text or "" for t in is_el.iter(T_TAG)))
+                    continue
+                v = c.find(V_TAG)
+                if v is None:
+                    append("")
+                elif cell_type == "s":
+                    if shared_strings is None:
+                        shared_strings = get_shared_strings(zf)
+                    append(shared_strings[int(v.text)])
+                else:
+                    append(v.text or "")
+            release_element(row)
+            if values:
+                yield values
+
+
+_GO_ESCAPE = str.maketrans({"\\": "\\\\", "\"": "\\\"", "\n": "\\n"})
 
 
 def escape_go_string(value: str) -> str:
-    escaped = (
-        value.replace("\\", "\\\\")
-        .replace("\"", "\\\"")
-        .replace("\n", "\\n")
-    )
-    return f'"{escaped}"'
+    if not value:
+        return '""'
+    return '"' + value.translate(_GO_ESCAPE) + '"'
 
 
-def build_catalog_entries(rows: List[List[str]]) -> List[Dict[str, Any]]:
-    header = rows[0]
+def build_catalog_entries(rows: Iterable[List[str]]) -> List[CatalogEntry]:
+    rows = iter(rows)
+    header = next(rows)
     idx_type = header.index("Type \n(XID)")
     idx_code = header.index("Code")
     idx_mnemonic = header.index("Mnemonic")
     idx_desc = header.index("Description")
     idx_imm = header.index("Resolution Bucket \n(Immediate Action)")
     idx_inv = header.index("Resolution Bucket \n(Investigatory Action)")
+    max_idx = max(idx_type, idx_code, idx_mnemonic, idx_desc, idx_imm, idx_inv)
 
-    entries: List[Dict[str, Any]] = []
-    for row in rows[1:]:
-        # pad to header length
-        if len(row) < len(header):
-            row = row + [""] * (len(header) - len(row))
+    entries: List[CatalogEntry] = []
+    for row in rows:
+        # pad only as far as the columns we actually read
+        if len(row) <= max_idx:
+            row = row + [""] * (max_idx + 1 - len(row))
         if row[idx_type] != "XID":
             continue
-        code_str = row[idx_code]
-        if not code_str or not code_str.isdigit():
+        try:
+            code = int(row[idx_code])
+        except ValueError:
+            continue
+        if code < 0:
             continue
         entries.append(
-            {
-                "code": int(code_str),
-                "mnemonic": row[idx_mnemonic].strip(),
-                "description": row[idx_desc].strip(),
-                "immediate": row[idx_imm].strip(),
-                "investigatory": row[idx_inv].strip(),
-            }
+            CatalogEntry(
+                code=code,
+                mnemonic=row[idx_mnemonic].strip(),
+                description=row[idx_desc].strip(),
+                immediate=row[idx_imm].strip(),
+                investigatory=row[idx_inv].strip(),
+            )
         )
-    entries.sort(key=lambda item: item["code"])
+    entries.sort(key=operator.attrgetter("code"))
     return entries
 
 
-def build_nvlink_rules(rows: List[List[str]]) -> List[Dict[str, Any]]:
-    header = rows[0]
+def build_nvlink_rules(rows: Iterable[List[str]]) -> List[NvlinkRule]:
+    rows = iter(rows)
+    header = next(rows)
     idx_xid = header.index("Xid")
     idx_subcode = header.index(
         "Subcode V1(<R575)/V2(>=R575)\nV1(<R575): IntrInfo[9:5]\nV2(>=R575):IntrInfo[6:0]"
@@ -120,13 +181,37 @@ def build_nvlink_rules(rows: List[List[str]]) -> List[Dict[str, Any]]:
     idx_hw_sw = header.index("HW/SW") if "HW/SW" in header else None
     idx_local_remote = header.index("Local/Remote (for items with '*' please see Customer User Guide tab)") if "Local/Remote (for items with '*' please see Customer User Guide tab)" in header else None
 
-    rules: List[Dict[str, Any]] = []
-    for row in rows[1:]:
-        if len(row) < len(header):
-            row = row + [""] * (len(header) - len(row))
-        xid_str = row[idx_xid].strip()
-        subcode = row[idx_subcode].strip()
-        if not xid_str or not xid_str.isdigit() or not subcode:
+    max_idx = max(
+        idx
+        for idx in (
+            idx_xid,
+            idx_subcode,
+            idx_intrinfo_v1,
+            idx_intrinfo_v2,
+            idx_error_status,
+            idx_resolution,
+            idx_action2,
+            idx_investigatory,
+            idx_severity,
+            idx_hw_sw,
+            idx_local_remote,
+        )
+        if idx is not None
+    )
+
+    rules: List[NvlinkRule] = []
+    for row in rows:
+        if len(row) <= max_idx:
+            row = row + [""] * (max_idx + 1 - len(row))
+        # low-cardinality columns are interned so repeated values share one object
+        subcode = sys.intern(row[idx_subcode].strip())
+        if not subcode:
+            continue
+        try:
+            xid = int(row[idx_xid])
+        except ValueError:
+            continue
+        if xid < 0:
             continue
         error_status_str = row[idx_error_status].strip() or "0x0"
         try:
@@ -134,74 +219,72 @@ def build_nvlink_rules(rows: List[List[str]]) -> List[Dict[str, Any]]:
         except ValueError:
             # Some rows have placeholders like 'N/A'
             continue
-        rule = {
-            "xid": int(xid_str),
-            "unit": subcode,
-            "intrinfo_v1": row[idx_intrinfo_v1].strip(),
-            "intrinfo_v2": row[idx_intrinfo_v2].strip(),
-            "error_status": error_status,
-            "resolution": row[idx_resolution].strip(),
-            "investigatory": row[idx_investigatory].strip(),
-            "severity": row[idx_severity].strip(),
-        }
-        if idx_action2 is not None:
-            rule["action2"] = row[idx_action2].strip()
-        if idx_hw_sw is not None:
-            rule["hw_sw"] = row[idx_hw_sw].strip()
-        if idx_local_remote is not None:
-            rule["local_remote"] = row[idx_local_remote].strip()
-        rules.append(rule)
-    rules.sort(key=lambda r: (r["xid"], r["unit"], r["error_status"]))
+        rules.append(
+            NvlinkRule(
+                xid=xid,
+                unit=subcode,
+                intrinfo_v1=row[idx_intrinfo_v1].strip(),
+                intrinfo_v2=row[idx_intrinfo_v2].strip(),
+                error_status=error_status,
+                resolution=row[idx_resolution].strip(),
+                investigatory=row[idx_investigatory].strip(),
+                severity=sys.intern(row[idx_severity].strip()),
+                action2=row[idx_action2].strip() if idx_action2 is not None else "",
+                hw_sw=sys.intern(row[idx_hw_sw].strip()) if idx_hw_sw is not None else "",
+                local_remote=sys.intern(row[idx_local_remote].strip()) if idx_local_remote is not None else "",
+            )
+        )
+    rules.sort(key=operator.attrgetter("xid", "unit", "error_status"))
     return rules
 
 
-def write_go(entries: List[Dict[str, Any]], rules: List[Dict[str, Any]]) -> str:
-    lines: List[str] = []
-    timestamp = datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z"
-    lines.append("// Code generated by gen-catalog/gen.py; DO NOT EDIT.")
-    lines.append(f"// Generated at {timestamp}. Source: https://docs.nvidia.com/deploy/xid-errors/analyzing-xid-catalog.html")
-    lines.append("")
-    lines.append("package xid")
-    lines.append("")
-    lines.append("// catalogEntries mirrors NVIDIA's XID catalog (sheet: \"Catalog\").")
-    lines.append("var catalogEntries = []catalogEntry{")
+def write_go(entries: List[CatalogEntry], rules: List[NvlinkRule], out: TextIO) -> None:
+    w = out.write
+    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+    w("// Code generated by gen-catalog/gen.py; DO NOT EDIT.\n")
+    w(f"// Generated at {timestamp}. Source: https://docs.nvidia.com/deploy/xid-errors/analyzing-xid-catalog.html\n")
+    w("\n")
+    w("package xid\n")
+    w("\n")
+    w("// catalogEntries mirrors NVIDIA's XID catalog (sheet: \"Catalog\").\n")
+    w("var catalogEntries = []catalogEntry{\n")
     for entry in entries:
-        lines.append(
-            "\t{"
-            f"Code: {entry['code']}, "
-            f"Mnemonic: {escape_go_string(entry['mnemonic'])}, "
-            f"Description: {escape_go_string(entry['description'])}, "
-            f"ImmediateResolution: {escape_go_string(entry['immediate'])}, "
-            f"InvestigatoryResolution: {escape_go_string(entry['investigatory'])},"
-            "},"
-        )
-    lines.append("}")
-    lines.append("")
-    lines.append("// nvlinkRules captures the NVLink5-specific decode table (sheet: \"XID 144-150 Decode\").")
-    lines.append("var nvlinkRules = []nvlinkRule{")
+        w("\t{Code: ")
+        w(str(entry.code))
+        w(", Mnemonic: ")
+        w(escape_go_string(entry.mnemonic))
+        w(", Description: ")
+        w(escape_go_string(entry.description))
+        w(", ImmediateResolution: ")
+        w(escape_go_string(entry.immediate))
+        w(", InvestigatoryResolution: ")
+        w(escape_go_string(entry.investigatory))
+        w(",},\n")
+    w("}\n")
+    w("\n")
+    w("// nvlinkRules captures the NVLink5-specific decode table (sheet: \"XID 144-150 Decode\").\n")
+    w("var nvlinkRules = []nvlinkRule{\n")
     for rule in rules:
-        line = (
-            "\t{"
-            f"Xid: {rule['xid']}, "
-            f"Unit: {escape_go_string(rule['unit'])}, "
-            f"IntrinfoPatternV1: {escape_go_string(rule['intrinfo_v1'])}, "
-            f"IntrinfoPatternV2: {escape_go_string(rule['intrinfo_v2'])}, "
-            f"ErrorStatus: 0x{rule['error_status']:08x}, "
-            f"Resolution: {escape_go_string(rule['resolution'])}, "
-            f"Investigatory: {escape_go_string(rule['investigatory'])}, "
-            f"Severity: {escape_go_string(rule['severity'])}"
-        )
-        if "action2" in rule and rule["action2"]:
-            line += f", Action2: {escape_go_string(rule['action2'])}"
-        if "hw_sw" in rule and rule["hw_sw"]:
-            line += f", HwSw: {escape_go_string(rule['hw_sw'])}"
-        if "local_remote" in rule and rule["local_remote"]:
-            line += f", LocalRemote: {escape_go_string(rule['local_remote'])}"
-        line += "},"
-        lines.append(line)
-    lines.append("}")
-    lines.append("")
-    return "\n".join(lines)
+        fields = [
+            f"Xid: {rule.xid}",
+            f"Unit: {escape_go_string(rule.unit)}",
+            f"IntrinfoPatternV1: {escape_go_string(rule.intrinfo_v1)}",
+            f"IntrinfoPatternV2: {escape_go_string(rule.intrinfo_v2)}",
+            f"ErrorStatus: 0x{rule.error_status:08x}",
+            f"Resolution: {escape_go_string(rule.resolution)}",
+            f"Investigatory: {escape_go_string(rule.investigatory)}",
+            f"Severity: {escape_go_string(rule.severity)}",
+        ]
+        if rule.action2:
+            fields.append(f"Action2: {escape_go_string(rule.action2)}")
+        if rule.hw_sw:
+            fields.append(f"HwSw: {escape_go_string(rule.hw_sw)}")
+        if rule.local_remote:
+            fields.append(f"LocalRemote: {escape_go_string(rule.local_remote)}")
+        w("\t{")
+        w(", ".join(fields))
+        w("},\n")
+    w("}\n")
 
 
 def main() -> int:
@@ -219,15 +302,12 @@ def main() -> int:
         return 1
 
     with zipfile.ZipFile(xlsx_path) as zf:
-        shared_strings = load_shared_strings(zf)
-        sheet1 = read_sheet(zf, "xl/worksheets/sheet1.xml", shared_strings)
-        sheet2 = read_sheet(zf, "xl/worksheets/sheet2.xml", shared_strings)
-
-    entries = build_catalog_entries(sheet1)
-    rules = build_nvlink_rules(sheet2)
+        get_shared_strings = functools.lru_cache(maxsize=None)(load_shared_strings)
+        entries = build_catalog_entries(iter_rows(zf, "xl/worksheets/sheet1.xml", get_shared_strings))
+        rules = build_nvlink_rules(iter_rows(zf, "xl/worksheets/sheet2.xml", get_shared_strings))
 
-    go_code = write_go(entries, rules)
-    output_path.write_text(go_code, encoding="utf-8")
+    with output_path.open("w", encoding="utf-8", buffering=1 << 20) as out:
+        write_go(entries, rules, out)
     print(f"Generated catalog data to {output_path}")
     return 0
 